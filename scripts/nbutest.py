@@ -3,6 +3,8 @@
 Объединение Excel-файлов и постобработка.
 
 Имена входных файлов и дата "поточнадата" берутся из app_settings.json.
+Если в app_settings.json задан "history_db", обогащённые строки периода
+дописываются в историю (yourpkg.history) для сравнения между месяцами.
 Логические блоки (статус2БЛОК, S070БЛОК, S186/190/242БЛОК) — из status2_map.json.
 
 Листы:
@@ -642,6 +644,29 @@ if __name__ == "__main__":
     # Сохраняем книгу
     wb.save(OUTPUT_FILE)
 
+    # ---- История по периодам (опционально, ключ "history_db" в app_settings.json).
+    # Пишется после сохранения книги: сбой истории не должен терять результат.
+    # Период: "history_period" из настроек, иначе дата из имён файлов (как у result_*),
+    # иначе месяц поточнадата.
+    history_db = settings.get("history_db")
+    if history_db:
+        file_periods = sorted(set(d for d in dates if d != "unknown"))
+        history_period = str(settings.get("history_period") or "").strip() or (
+            file_periods[0] if len(file_periods) == 1 else CURRENT_DATE.strftime("%Y-%m"))
+        try:
+            from yourpkg.history import append_period, DEFAULT_KEY_COLS
+        except ImportError as e:
+            print(f"ВНИМАНИЕ: история не записана — пакет yourpkg недоступен ({e}). "
+                  f"Установите его (pip install -e .) или запускайте через `yourpkg run`.", flush=True)
+        else:
+            try:
+                history_rows = append_period(str(history_db), combined, history_period,
+                                             key_cols=settings.get("history_key") or DEFAULT_KEY_COLS)
+                print(f"История: записано строк {history_rows} за период {history_period} -> {history_db}")
+            except Exception as e:
+                print(f"ВНИМАНИЕ: история не записана ({type(e).__name__}: {e}). "
+                      f"Результат {OUTPUT_FILE} сохранён.", flush=True)
+
     # Финал
     print(f"Готово. Записано строк (лист1): {rows_written_1} из {total_rows_1}. Колонок (лист1): {final_df.shape[1]}")
     print(f"Excel сохранён: {os.path.abspath(OUTPUT_FILE)}")
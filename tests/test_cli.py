@@ -0,0 +1,70 @@
+import os
+import sys
+import time
+import subprocess
+
+import pytest
+
+from yourpkg.cli import DEFAULT_BUDGET_SEC, HEAVY_MODULES, main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXAMPLES = os.path.join(ROOT, "examples")
+
+
+def _run(code):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, "-c", code], env=env, cwd=ROOT,
+                          capture_output=True, text=True)
+
+
+@pytest.mark.parametrize("argv", [
+    None,
+    ["validate", "--workdir", EXAMPLES],
+    ["run", "--dry-run", "--workdir", EXAMPLES],
+])
+def test_light_commands_do_not_import_heavy_modules(argv):
+    code = "\n".join([
+        "import sys, io, contextlib, yourpkg.cli",
+        f"argv = {argv!r}",
+        "if argv:",
+        "    with contextlib.redirect_stdout(io.StringIO()):",
+        "        yourpkg.cli.main(argv)",
+        f"print(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))",
+        "print('DONE')",
+    ])
+    proc = _run(code)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.splitlines() == ["[]", "DONE"]
+
+
+@pytest.mark.parametrize("args", [
+    ["-c", "import yourpkg.cli"],
+    ["-m", "yourpkg", "validate", "--workdir", EXAMPLES],
+    ["-m", "yourpkg", "run", "--dry-run", "--workdir", EXAMPLES],
+])
+def test_startup_budget(args):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    best = None
+    for _ in range(3):
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, *args], env=env, cwd=ROOT,
+                              capture_output=True, text=True)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+    assert "Traceback" not in proc.stderr, proc.stderr
+    assert proc.returncode in (0, 1)
+    assert best < DEFAULT_BUDGET_SEC
+
+
+def test_merge_without_keys_is_usage_error(capsys):
+    with pytest.raises(SystemExit) as exc:
+        main(["merge", "a.csv", "b.csv"])
+    assert exc.value.code == 2
+
+
+def test_merge_unknown_key_reports_error(tmp_path, capsys):
+    rc = main(["merge", os.path.join(EXAMPLES, "example_first.csv"),
+               os.path.join(EXAMPLES, "example_second.csv"),
+               "--left-key", "nope", "--right-key", "id", "-o", str(tmp_path / "m.xlsx")])
+    assert rc == 1
+    assert "ОШИБКА: 'nope' нет в первом файле" in capsys.readouterr().err
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+from yourpkg.history import (
+    HISTORY_COLS, MISSING, NUMERIC_HISTORY_COLS,
+    append_period, list_periods, load_period, period_delta, transition_matrix,
+)
+
+
+def make_df(rows):
+    base = {c: (0 if c in NUMERIC_HISTORY_COLS else "") for c in HISTORY_COLS}
+    return pd.DataFrame([{**base, "col_5": "CC 365", **r} for r in rows])
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "history.sqlite")
+    append_period(path, make_df([
+        {"col_6": "A", "статус2": "Активний", "col_38": 0},
+        {"col_6": "B", "статус2": "Прострочений", "col_38": 10},
+        {"col_6": "C", "статус2": "", "col_38": 5},
+    ]), "2025-06")
+    append_period(path, make_df([
+        {"col_6": "A", "статус2": "Прострочений", "col_38": 3},
+        {"col_6": "B", "статус2": "Закритий", "col_38": 0},
+        {"col_6": "D", "статус2": "Активний", "col_38": 0},
+    ]), "2025-07")
+    return path
+
+
+def test_list_periods(db):
+    assert list_periods(db) == ["2025-06", "2025-07"]
+
+
+def test_rewrite_replaces_period(db):
+    append_period(db, make_df([{"col_6": "Z", "статус2": "Активний"}]), "2025-06")
+    assert list(load_period(db, "2025-06", ["col_6"])["col_6"]) == ["Z"]
+    assert len(load_period(db, "2025-07")) == 3
+
+
+def test_readers_require_existing_db(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        list_periods(str(tmp_path / "nope.sqlite"))
+    assert not (tmp_path / "nope.sqlite").exists()
+
+
+def test_period_delta_numeric_inner(db):
+    out = period_delta(db, "2025-06", "2025-07", "col_38").set_index("contract_key")
+    assert sorted(out.index) == ["CC 365|A", "CC 365|B"]
+    assert out.loc["CC 365|A", "delta"] == 3
+    assert out.loc["CC 365|B", "delta"] == -10
+
+
+def test_period_delta_text_left(db):
+    out = period_delta(db, "2025-06", "2025-07", "статус2", how="left").set_index("contract_key")
+    assert len(out) == 3
+    assert out.loc["CC 365|B", "changed"]
+    assert out.loc["CC 365|C", "curr"] is None
+
+
+def test_transition_matrix_new_and_gone(db):
+    m = transition_matrix(db, "2025-06", "2025-07", "статус2")
+    assert m.loc["Активний", "Прострочений"] == 1
+    assert m.loc["Прострочений", "Закритий"] == 1
+    # C пропал (его статус был пустым ""), D — новый
+    assert m.loc["", MISSING] == 1
+    assert m.loc[MISSING, "Активний"] == 1
+    assert int(m.values.sum()) == 4
+
+
+def test_duplicate_keys_rejected(db):
+    dup = make_df([
+        {"col_1": "1", "col_6": "A", "статус2": "Активний"},
+        {"col_1": "2", "col_6": "A", "статус2": "Закритий"},
+    ])
+    with pytest.raises(ValueError, match="не уникален"):
+        append_period(db, dup, "2025-08")
+    assert "2025-08" not in list_periods(db)
+
+
+def test_composite_key_resolves_duplicates(db):
+    # Один номер договора у двух кредиторов: различаем по продукту
+    df = make_df([
+        {"col_5": "CC 365", "col_6": "A", "статус2": "Активний"},
+        {"col_5": "MC PDL", "col_6": "A", "статус2": "Закритий"},
+    ])
+    assert append_period(db, df, "2025-08") == 2
+    with pytest.raises(ValueError):
+        append_period(db, df, "2025-09", key_cols=["col_6"])
+    m = transition_matrix(db, "2025-07", "2025-08", "статус2")
+    assert int(m.values.sum()) == 4  # A, B, D из июля + новый MC PDL|A, без размножения
@@ -1,2 +1,2 @@
-__all__ = ["merge"]
+__all__ = ["merge", "cli"]
 __version__ = "0.1.0"
@@ -0,0 +1,4 @@
+import sys
+from yourpkg.cli import main
+
+sys.exit(main())
@@ -0,0 +1,264 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import subprocess
+from datetime import datetime
+
+# Точка входа `yourpkg run|validate|merge|bench`.
+# Тяжёлые зависимости (pandas/numpy/openpyxl) импортируются только внутри
+# подкоманд, которым они нужны: validate и run --dry-run обходятся stdlib.
+
+SETTINGS_JSON = "app_settings.json"
+CONFIG_JSON = "status2_map.json"
+CONFIG_BLOCKS = ["статус2БЛОК", "S070БЛОК", "S186БЛОК", "S190БЛОК", "S242БЛОК"]
+HEAVY_MODULES = ["pandas", "numpy", "openpyxl"]
+DEFAULT_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              "scripts", "nbutest.py")
+DEFAULT_BUDGET_SEC = 0.5
+
+
+def _load_json(path: str, errors: list):
+    if not os.path.exists(path):
+        errors.append(f"Не найден файл {path}")
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError as e:
+        errors.append(f"Ошибка JSON в {path}: {e}")
+        return None
+
+
+def build_plan(workdir="."):
+    # Те же проверки, что делает scripts/nbutest.py до чтения Excel
+    errors, plan = [], {}
+    settings = _load_json(os.path.join(workdir, SETTINGS_JSON), errors)
+    config = _load_json(os.path.join(workdir, CONFIG_JSON), errors)
+
+    if isinstance(settings, dict):
+        if isinstance(settings.get("files"), list):
+            files = [str(p) for p in settings["files"]]
+        else:
+            files = [str(settings[k]) for k in ("file1", "file2") if settings.get(k)]
+        if not files:
+            errors.append(f"В {SETTINGS_JSON} нужно указать 'files' или 'file1'/'file2'.")
+        available = [p for p in files if os.path.exists(os.path.join(workdir, p))]
+        if files and not available:
+            errors.append(f"Не найден ни один из входных файлов из {SETTINGS_JSON}.")
+
+        date_str = settings.get("поточнадата")
+        current_date = None
+        try:
+            current_date = datetime.strptime(str(date_str).strip(), "%d.%m.%Y")
+        except Exception:
+            errors.append(f"Значение 'поточнадата' в {SETTINGS_JSON} должно быть в формате 'дд.мм.гггг'.")
+
+        dates = []
+        for p in available:
+            m = re.search(r"_(\d{4}-\d{2})", os.path.basename(p))
+            dates.append(m.group(1) if m else "unknown")
+        # Период истории — как в scripts/nbutest.py
+        file_periods = sorted(set(d for d in dates if d != "unknown"))
+        history_period = str(settings.get("history_period") or "").strip() or (
+            file_periods[0] if len(file_periods) == 1
+            else current_date.strftime("%Y-%m") if current_date else None)
+        plan = {
+            "files": available,
+            "missing": [p for p in files if p not in available],
+            "sheet_name": settings.get("sheet_name", "Лист1"),
+            "поточнадата": current_date.strftime("%d.%m.%Y") if current_date else None,
+            "output": f"result_{'_'.join(dates) if dates else 'unknown'}.xlsx",
+            "history_db": settings.get("history_db"),
+            "history_period": history_period,
+        }
+    elif settings is not None:
+        errors.append(f"{SETTINGS_JSON} должен содержать JSON-объект.")
+
+    if isinstance(config, dict):
+        absent = [b for b in CONFIG_BLOCKS if not config.get(b)]
+        if absent:
+            errors.append(f"В {CONFIG_JSON} нет блоков: {', '.join(absent)}")
+    elif config is not None:
+        errors.append(f"{CONFIG_JSON} должен содержать JSON-объект.")
+    return errors, plan
+
+
+def _print_report(errors, plan):
+    for k, v in plan.items():
+        print(f"{k}: {v}")
+    for e in errors:
+        print(f"ОШИБКА: {e}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+def cmd_validate(args):
+    errors, plan = build_plan(args.workdir)
+    if not errors:
+        print("Настройки корректны.")
+    return _print_report(errors, plan if args.verbose else {})
+
+
+def cmd_run(args):
+    errors, plan = build_plan(args.workdir)
+    # scripts/ не входит в пакет: скрипт есть только в checkout репозитория
+    script = os.path.abspath(args.script)
+    if not os.path.exists(script):
+        errors.append(f"Не найден скрипт {script} (нужен checkout репозитория или --script)")
+    if args.dry_run or errors:
+        return _print_report(errors, plan)
+    import runpy
+    os.chdir(args.workdir)
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    return 0
+
+
+def cmd_merge(args):
+    from yourpkg.merge import merge_two_files
+    try:
+        out = merge_two_files(args.file1, args.file2, mode=args.mode, how=args.how,
+                              left_key=args.left_key, right_key=args.right_key,
+                              out_path=args.out)
+    except (ValueError, KeyError, FileNotFoundError) as e:
+        msg = e.args[0] if isinstance(e, KeyError) and e.args else e
+        return _print_report([str(msg)], {})
+    print(f"Excel сохранён: {os.path.abspath(out)}")
+    return 0
+
+
+PROBE_SENTINEL = "PROBE_OK"
+
+
+def _crashed(proc, ok_codes):
+    return proc.returncode not in ok_codes or "Traceback (most recent call last)" in proc.stderr
+
+
+def _time_cmd(cmd, env, cwd, repeat, ok_codes):
+    # Возвращает лучшее время и первый упавший запуск (или None)
+    best, bad = None, None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        proc = subprocess.run(cmd, env=env, cwd=cwd, stdout=subprocess.DEVNULL,
+                              stderr=subprocess.PIPE, text=True)
+        dt = time.perf_counter() - t0
+        best = dt if best is None else min(best, dt)
+        if bad is None and _crashed(proc, ok_codes):
+            bad = proc
+    return best, bad
+
+
+def _probe_heavy(argv, env, cwd):
+    # Выполняет main(argv) в отдельном процессе и смотрит sys.modules.
+    # Sentinel в конце: пустой вывод (упавший/оборванный процесс) — не успех.
+    code = "\n".join([
+        "import sys, io, contextlib, yourpkg.cli",
+        f"argv = {argv!r}",
+        "if argv:",
+        "    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):",
+        "        yourpkg.cli.main(argv)",
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))",
+        f"print({PROBE_SENTINEL!r})",
+    ])
+    proc = subprocess.run([sys.executable, "-c", code], env=env, cwd=cwd,
+                          capture_output=True, text=True)
+    lines = proc.stdout.splitlines()
+    if proc.returncode != 0 or not lines or lines[-1] != PROBE_SENTINEL:
+        return f"проверка упала (код {proc.returncode}): {proc.stderr.strip()[-500:]}"
+    if len(lines) > 1 and lines[0]:
+        return f"подтягивает {lines[0]}"
+    return None
+
+
+def cmd_bench(args):
+    # Холодный старт в отдельном процессе; берём лучшее из N повторов
+    env = dict(os.environ)
+    pkg_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (pkg_root, env.get("PYTHONPATH")) if p)
+    # -c / -m ставят cwd первым в sys.path: запускаем из pkg_root, чтобы мерить этот пакет
+    workdir = os.path.abspath(args.workdir)
+    problems = []
+
+    # Тяжёлые модули проверяем и после самого импорта, и после лёгких подкоманд
+    probes = [
+        ("import yourpkg.cli", None),
+        ("yourpkg validate", ["validate", "--workdir", workdir]),
+        ("yourpkg run --dry-run", ["run", "--dry-run", "--workdir", workdir]),
+    ]
+    for name, argv in probes:
+        problem = _probe_heavy(argv, env, pkg_root)
+        if problem:
+            problems.append(f"{name}: {problem}")
+
+    # validate / run --dry-run возвращают 1 при ошибках настроек — это не падение
+    cases = [
+        ("python (пустой)", [sys.executable, "-c", "pass"], {0}),
+        ("import yourpkg.cli", [sys.executable, "-c", "import yourpkg.cli"], {0}),
+        ("yourpkg --help", [sys.executable, "-m", "yourpkg", "--help"], {0}),
+        ("yourpkg validate", [sys.executable, "-m", "yourpkg", "validate",
+                              "--workdir", workdir], {0, 1}),
+        ("yourpkg run --dry-run", [sys.executable, "-m", "yourpkg", "run", "--dry-run",
+                                   "--workdir", workdir], {0, 1}),
+    ]
+    for name, cmd, ok_codes in cases:
+        dt, bad = _time_cmd(cmd, env, pkg_root, args.repeat, ok_codes)
+        over = dt > args.budget
+        mark = "  УПАЛ" if bad is not None else ("  > бюджет" if over else "")
+        print(f"{name:<26} {dt * 1000:8.1f} мс{mark}")
+        if bad is not None:
+            problems.append(f"{name} упал (код {bad.returncode}): {bad.stderr.strip()[-500:]}")
+        elif over:
+            problems.append(f"{name} превысил бюджет")
+    print(f"Бюджет: {args.budget * 1000:.0f} мс")
+    for msg in problems:
+        print(f"ОШИБКА: {msg}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="yourpkg")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("run", help="запустить scripts/nbutest.py")
+    p.add_argument("--workdir", default=".", help="папка с app_settings.json и status2_map.json")
+    p.add_argument("--script", default=DEFAULT_SCRIPT)
+    p.add_argument("--dry-run", action="store_true", help="только проверить настройки и показать план")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("validate", help="проверить app_settings.json и status2_map.json")
+    p.add_argument("--workdir", default=".")
+    p.add_argument("-v", "--verbose", action="store_true")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("merge", help="объединить два файла в Excel")
+    p.add_argument("file1")
+    p.add_argument("file2")
+    p.add_argument("--mode", choices=["join", "hconcat"], default="join")
+    p.add_argument("--how", choices=["inner", "left", "right", "outer"], default="inner")
+    p.add_argument("--left-key")
+    p.add_argument("--right-key")
+    p.add_argument("-o", "--out", default="merged_result.xlsx")
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser("bench", help="замерить время старта подкоманд")
+    p.add_argument("--workdir", default=".")
+    p.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SEC, help="секунды на команду")
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "merge" and args.mode == "join" and not (args.left_key and args.right_key):
+        parser.error("для --mode join нужны --left-key и --right-key")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+import os
+import sqlite3
+from datetime import datetime
+import pandas as pd
+
+# Локальное хранилище обогащённых строк по периодам (SQLite).
+# Позволяет сравнивать договоры между месяцами, не перечитывая result_*.xlsx.
+# Договоры сопоставляются по contract_key — склейке колонок key_cols
+# (по умолчанию продукт col_5 + номер договора col_6; col_1 — это N з/п,
+# он не стабилен между месяцами). Ключ обязан быть уникален в периоде.
+
+TABLE = "contracts"
+DEFAULT_KEY_COLS = ("col_5", "col_6")
+KEY_SEP = "|"
+MISSING = "<нет>"  # в transition_matrix: договора нет в периоде (≠ пустому значению "")
+
+TEXT_HISTORY_COLS = (
+    [f"col_{i}" for i in (1, 2, 3, 4, 5, 6, 7, 8, 36, 37)]
+    + ["статус2", "датазакинчення",
+       "S070Код", "S070Строка",
+       "S186Строка", "S186Код", "S186КодиСтрока",
+       "S190Строка", "S190Код", "S190КодИСтрока",
+       "S242Строка", "S242Код", "S242КодИСтрока"]
+)
+NUMERIC_HISTORY_COLS = (
+    ["col_9"] + [f"col_{i}" for i in range(10, 36)] + ["col_38"]
+    + ["СтрокДоПогашення", "КомКредСумаУзвітномуперіоді"]
+)
+HISTORY_COLS = TEXT_HISTORY_COLS + NUMERIC_HISTORY_COLS
+
+
+def _q(name: str) -> str:
+    if name not in ("period", "contract_key") and name not in HISTORY_COLS:
+        raise KeyError(f"'{name}' нет в хранилище истории")
+    return '"' + name + '"'
+
+
+def _connect(db_path: str, create=False) -> sqlite3.Connection:
+    # Читатели требуют существующий файл; схему создаёт/дополняет только запись
+    if not create:
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Не найден файл истории {db_path}")
+        return sqlite3.connect(db_path)
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    col_types = {c: "TEXT" for c in TEXT_HISTORY_COLS}
+    col_types.update({c: "REAL" for c in NUMERIC_HISTORY_COLS})
+    col_types = {"contract_key": "TEXT", **col_types}
+    cols_sql = ", ".join(["period TEXT NOT NULL"] + [f"{_q(c)} {t}" for c, t in col_types.items()])
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} ({cols_sql})")
+    # Старые базы: дописываем колонки, появившиеся в HISTORY_COLS позже
+    existing = {r[1] for r in conn.execute(f"PRAGMA table_info({TABLE})")}
+    for c, t in col_types.items():
+        if c not in existing:
+            conn.execute(f"ALTER TABLE {TABLE} ADD COLUMN {_q(c)} {t}")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{TABLE}_key_period ON {TABLE} (contract_key, period)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{TABLE}_period ON {TABLE} (period)")
+    return conn
+
+
+def _text_value(val):
+    if val is None or (not isinstance(val, str) and pd.isna(val)):
+        return None
+    if isinstance(val, (pd.Timestamp, datetime)):
+        return val.strftime("%d.%m.%Y")
+    return str(val)
+
+
+def _num_value(val):
+    if val is None or (isinstance(val, str) and val.strip() == ""):
+        return None
+    try:
+        num = float(val)
+    except Exception:
+        return None
+    return None if pd.isna(num) else num
+
+
+def period_of(date) -> str:
+    return pd.to_datetime(date, dayfirst=True).strftime("%Y-%m")
+
+
+def append_period(db_path: str, df: pd.DataFrame, period: str, key_cols=DEFAULT_KEY_COLS) -> int:
+    # Повторная запись того же периода заменяет его строки целиком.
+    # Дубли contract_key внутри периода — ValueError: иначе джойны размножат строки.
+    missing = [c for c in HISTORY_COLS if c not in df.columns]
+    if missing:
+        raise KeyError(f"В таблице нет колонок для истории: {', '.join(missing)}")
+    key_cols = list(key_cols)
+    bad_keys = [c for c in key_cols if c not in TEXT_HISTORY_COLS]
+    if not key_cols or bad_keys:
+        raise KeyError(f"Ключ истории должен состоять из текстовых колонок: {', '.join(bad_keys) or '—'}")
+    text_part = df[TEXT_HISTORY_COLS].map(_text_value)
+    num_part = df[NUMERIC_HISTORY_COLS].map(_num_value)
+    keys = text_part[key_cols].fillna("").agg(KEY_SEP.join, axis=1)
+    dup = keys[keys.duplicated(keep=False)]
+    if not dup.empty:
+        sample = ", ".join(sorted(set(dup))[:5])
+        raise ValueError(f"Ключ {'+'.join(key_cols)} не уникален в периоде {period}: "
+                         f"{dup.nunique()} повторов (например: {sample})")
+    rows = [(period, k, *t, *n) for k, t, n in zip(keys,
+                                                   text_part.itertuples(index=False, name=None),
+                                                   num_part.itertuples(index=False, name=None))]
+    placeholders = ", ".join(["?"] * (len(HISTORY_COLS) + 2))
+    cols_sql = ", ".join(["period", "contract_key"] + [_q(c) for c in HISTORY_COLS])
+    conn = _connect(db_path, create=True)
+    try:
+        with conn:
+            conn.execute(f"DELETE FROM {TABLE} WHERE period = ?", (period,))
+            conn.executemany(f"INSERT INTO {TABLE} ({cols_sql}) VALUES ({placeholders})", rows)
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def list_periods(db_path: str) -> list:
+    conn = _connect(db_path)
+    try:
+        cur = conn.execute(f"SELECT DISTINCT period FROM {TABLE} ORDER BY period")
+        return [r[0] for r in cur.fetchall()]
+    finally:
+        conn.close()
+
+
+def load_period(db_path: str, period: str, columns=None) -> pd.DataFrame:
+    cols = list(columns) if columns else HISTORY_COLS
+    cols_sql = ", ".join(_q(c) for c in cols)
+    conn = _connect(db_path)
+    try:
+        return pd.read_sql_query(f"SELECT {cols_sql} FROM {TABLE} WHERE period = ?",
+                                 conn, params=(period,))
+    finally:
+        conn.close()
+
+
+def period_delta(db_path: str, prev_period: str, curr_period: str,
+                 value_col="col_38", how="inner") -> pd.DataFrame:
+    # Изменение value_col по договорам (contract_key) между двумя периодами
+    if how not in ("inner", "left"):
+        raise ValueError("how должен быть 'inner' или 'left'")
+    col = _q(value_col)
+    join = "JOIN" if how == "inner" else "LEFT JOIN"
+    sql = (
+        f"SELECT p.contract_key AS contract_key, p.{col} AS prev, c.{col} AS curr "
+        f"FROM {TABLE} p {join} {TABLE} c "
+        f"ON c.contract_key = p.contract_key AND c.period = ? "
+        f"WHERE p.period = ?"
+    )
+    conn = _connect(db_path)
+    try:
+        out = pd.read_sql_query(sql, conn, params=(curr_period, prev_period))
+    finally:
+        conn.close()
+    if value_col in NUMERIC_HISTORY_COLS:
+        out["delta"] = out["curr"] - out["prev"]
+    else:
+        out["changed"] = out["prev"].fillna("") != out["curr"].fillna("")
+    return out
+
+
+def transition_matrix(db_path: str, prev_period: str, curr_period: str,
+                      col="статус2") -> pd.DataFrame:
+    # Матрица переходов: строки — значение в prev_period, колонки — в curr_period.
+    # Ключи — объединение contract_key обоих периодов: пропавшие договоры попадают
+    # в колонку MISSING, новые (есть только в curr_period) — в строку MISSING.
+    # Пустое значение колонки остаётся "".
+    c = _q(col)
+    sql = (
+        f"SELECT CASE WHEN p.contract_key IS NULL THEN ? ELSE COALESCE(p.{c}, '') END AS prev, "
+        f"       CASE WHEN n.contract_key IS NULL THEN ? ELSE COALESCE(n.{c}, '') END AS curr, "
+        f"       COUNT(*) AS cnt "
+        f"FROM (SELECT contract_key FROM {TABLE} WHERE period = ? "
+        f"      UNION SELECT contract_key FROM {TABLE} WHERE period = ?) k "
+        f"LEFT JOIN {TABLE} p ON p.contract_key = k.contract_key AND p.period = ? "
+        f"LEFT JOIN {TABLE} n ON n.contract_key = k.contract_key AND n.period = ? "
+        f"GROUP BY 1, 2"
+    )
+    conn = _connect(db_path)
+    try:
+        pairs = pd.read_sql_query(sql, conn, params=(MISSING, MISSING,
+                                                     prev_period, curr_period,
+                                                     prev_period, curr_period))
+    finally:
+        conn.close()
+    return (pairs.pivot_table(index="prev", columns="curr", values="cnt",
+                              aggfunc="sum", fill_value=0)
+            .rename_axis(index=prev_period, columns=curr_period))